@@ -284,7 +284,7 @@ def invert_msp(mesh_fname, data_fname, n_layers, priors=None, patch_size=5, n_te
     if woi is None:
         woi = [-np.inf, np.inf]
 
-    priors = [x + 1 for x in priors]
+    priors = np.asarray(priors) + 1
     if isinstance(woi, np.ndarray):
         woi = woi.tolist()
 
@@ -437,18 +437,16 @@ def invert_sliding_window(prior, mesh_fname, data_fname, n_layers, patch_size=5,
     time_step = time[1] - time[0]  # Compute the difference in time between steps
     win_steps = int(round(win_size / time_step))  # Calculate the number of steps in each window
 
-    wois = []
     if win_overlap:
-        for t_idx in range(len(time)):
-            win_l = max(0, int(np.ceil(t_idx - win_steps / 2)))
-            win_r = min(len(time) - 1, int(np.floor(t_idx + win_steps / 2)))
-            woi = [time[win_l], time[win_r]]
-            wois.append(woi)
+        # Window centred on each time step, truncated at the edges of the epoch
+        t_idx = np.arange(len(time))
+        win_l = np.maximum(0, np.ceil(t_idx - win_steps / 2).astype(int))
+        win_r = np.minimum(len(time) - 1, np.floor(t_idx + win_steps / 2).astype(int))
+        wois = np.column_stack([time[win_l], time[win_r]])
     else:
         time_steps = np.linspace(time[0], time[-1], int((time[-1] - time[0]) / win_size + 1))
-        for i in range(1, len(time_steps)):
-            wois.append([time_steps[i - 1], time_steps[i]])
-    wois = np.array(wois, dtype=float)
+        wois = np.column_stack([time_steps[:-1], time_steps[1:]])
+    wois = wois.astype(float)
 
     # Extract directory name and file name without extension
     data_dir, fname_with_ext = os.path.split(data_fname)
@@ -588,10 +586,8 @@ def load_source_time_series(data_fname, mu_matrix=None, inv_fname=None, vertices
             mu_matrix = mu_matrix[vertices, :]
 
     if len(sensor_data.shape) > 2:
-        n_trials = sensor_data.shape[2]
-        source_ts = np.zeros((mu_matrix.shape[0], len(time), n_trials))
-        for trial in range(n_trials):
-            source_ts[:, :, trial] = mu_matrix @ sensor_data[:, :, trial]
+        # Project all trials at once (sources x time x trial)
+        source_ts = np.tensordot(mu_matrix, sensor_data, axes=([1], [0]))
     else:
         source_ts = mu_matrix @ sensor_data
 
@@ -41,6 +41,84 @@ import matlab
 from lameg.util import spm_context
 
 
+def _to_matlab_double(array):
+    """
+    Convert a numpy array to a MATLAB double array.
+
+    The array is passed to MATLAB through the buffer protocol, avoiding the construction of an
+    intermediate nested list. If the runtime does not accept an array initializer (older runtimes
+    reject it with either a TypeError or a ValueError, depending on the version), the array is
+    converted via a list instead.
+
+    Parameters:
+    array (array_like): Array to convert.
+
+    Returns:
+    matlab.double: The converted MATLAB array.
+    """
+    array = np.ascontiguousarray(array, dtype=np.float64)
+    try:
+        return matlab.double(array)
+    except (TypeError, ValueError):
+        return matlab.double(array.tolist())
+
+
+def _simulate(spm, data_file, prefix, sim_vertices, sim_signals, dipole_orientations,
+              dipole_moments, sim_patch_sizes, snr, sim_woi):
+    """
+    Run the SPM simulation shared by the current density and dipole simulation functions.
+
+    Parameters:
+    spm (spm_standalone): Running instance of standalone SPM.
+    data_file (str): Filename or path of the MEG/EEG data file used as a template for simulation.
+    prefix (str): Prefix for the output simulated data filename.
+    sim_vertices (list or int): Indices of vertices where simulations are centered.
+    sim_signals (ndarray): Array of simulated signals.
+    dipole_orientations (ndarray or None): Array of dipole orientations, or None to use the mesh
+                                           normals (current density simulation).
+    dipole_moments (list or float): Dipole moments for the simulation.
+    sim_patch_sizes (list or int): Sizes of patches around each vertex for the simulation.
+    snr (float): Signal-to-noise ratio for the simulation.
+    sim_woi (list): Window of interest for the simulation as [start, end].
+
+    Returns:
+    str: Filename of the generated simulated data.
+    """
+    sim_vertices = np.atleast_1d(sim_vertices)
+    dipole_moments = np.atleast_1d(dipole_moments)
+    sim_patch_sizes = np.atleast_1d(sim_patch_sizes)
+
+    with h5py.File(data_file, 'r') as file:
+        verts = file[file['D']['other']['inv'][0][0]]['mesh']['tess_mni']['vert'][()].T
+
+    sim_coords = verts[sim_vertices, :]
+
+    if dipole_orientations is None:
+        sim_orientations = matlab.double([])
+    else:
+        sim_orientations = _to_matlab_double(dipole_orientations)
+
+    spm.spm_eeg_simulate(
+        data_file,
+        prefix,
+        _to_matlab_double(sim_coords),
+        _to_matlab_double(sim_signals),
+        sim_orientations,
+        matlab.double(sim_woi),
+        matlab.double([]),
+        float(snr),
+        matlab.double([]),
+        matlab.double([]),
+        _to_matlab_double(sim_patch_sizes),
+        _to_matlab_double(dipole_moments),
+        nargout=0
+    )
+
+    data_dir = os.path.dirname(data_file)
+    data_fname = os.path.split(os.path.splitext(data_file)[0])[1]
+    return os.path.join(data_dir, f'{prefix}{data_fname}.mat')
+
+
 def run_current_density_simulation(data_file, prefix, sim_vertices, sim_signals, dipole_moments,
                                    sim_patch_sizes, snr, sim_woi=None, spm_instance=None):
     """
@@ -76,40 +154,9 @@ def run_current_density_simulation(data_file, prefix, sim_vertices, sim_signals,
     if sim_woi is None:
         sim_woi = [-np.inf, np.inf]
 
-    if np.isscalar(sim_vertices):
-        sim_vertices=[sim_vertices]
-    if np.isscalar(dipole_moments):
-        dipole_moments=[dipole_moments]
-    if np.isscalar(sim_patch_sizes):
-        sim_patch_sizes=[sim_patch_sizes]
-
-    with h5py.File(data_file, 'r') as file:
-        verts = file[file['D']['other']['inv'][0][0]]['mesh']['tess_mni']['vert'][()].T
-
-    sim_coords = np.zeros((len(sim_vertices),3))
-    for c_idx,i in enumerate(sim_vertices):
-        sim_coords[c_idx,:]=verts[i, :]
-
     with spm_context(spm_instance) as spm:
-        spm.spm_eeg_simulate(
-            data_file,
-            prefix,
-            matlab.double(sim_coords.tolist()),
-            matlab.double(sim_signals.tolist()),
-            matlab.double([]),
-            matlab.double(sim_woi),
-            matlab.double([]),
-            float(snr),
-            matlab.double([]),
-            matlab.double([]),
-            matlab.double(sim_patch_sizes),
-            matlab.double(dipole_moments),
-            nargout=0
-        )
-
-    data_dir = os.path.dirname(data_file)
-    data_fname = os.path.split(os.path.splitext(data_file)[0])[1]
-    sim_fname= os.path.join(data_dir, f'{prefix}{data_fname}.mat')
+        sim_fname = _simulate(spm, data_file, prefix, sim_vertices, sim_signals, None,
+                              dipole_moments, sim_patch_sizes, snr, sim_woi)
 
     return sim_fname
 
@@ -157,42 +204,9 @@ def run_dipole_simulation(data_file, prefix, sim_vertices, sim_signals, dipole_o
     if sim_woi is None:
         sim_woi = [-np.inf, np.inf]
 
-    if np.isscalar(sim_vertices):
-        sim_vertices=[sim_vertices]
-
-    if np.isscalar(dipole_moments):
-        dipole_moments=[dipole_moments]
-
-    if np.isscalar(sim_patch_sizes):
-        sim_patch_sizes=[sim_patch_sizes]
-
-    with h5py.File(data_file, 'r') as file:
-        verts = file[file['D']['other']['inv'][0][0]]['mesh']['tess_mni']['vert'][()].T
-
-    sim_coords = np.zeros((len(sim_vertices), 3))
-    for c_idx, i in enumerate(sim_vertices):
-        sim_coords[c_idx, :] = verts[i, :]
-
     with spm_context(spm_instance) as spm:
-        spm.spm_eeg_simulate(
-            data_file,
-            prefix,
-            matlab.double(sim_coords.tolist()),
-            matlab.double(sim_signals.tolist()),
-            matlab.double(dipole_orientations.tolist()),
-            matlab.double(sim_woi),
-            matlab.double([]),
-            float(snr),
-            matlab.double([]),
-            matlab.double([]),
-            matlab.double(sim_patch_sizes),
-            matlab.double(dipole_moments),
-            nargout=0
-        )
-
-        data_dir = os.path.dirname(data_file)
-        data_fname = os.path.split(os.path.splitext(data_file)[0])[1]
-        sim_fname = os.path.join(data_dir, f'{prefix}{data_fname}.mat')
+        sim_fname = _simulate(spm, data_file, prefix, sim_vertices, sim_signals,
+                              dipole_orientations, dipole_moments, sim_patch_sizes, snr, sim_woi)
 
         if average_trials:
             cfg = {
@@ -226,6 +240,7 @@ def run_dipole_simulation(data_file, prefix, sim_vertices, sim_signals, dipole_o
                 nargout=0
             )
             os.remove(name)
-            sim_fname = os.path.join(data_dir, f'm{prefix}{data_fname}.mat')
+            sim_dir, sim_base = os.path.split(sim_fname)
+            sim_fname = os.path.join(sim_dir, f'm{sim_base}')
 
     return sim_fname
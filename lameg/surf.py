@@ -36,21 +36,20 @@ Example:
 import os
 import copy
 import subprocess
-from collections import defaultdict
 
 from joblib import Parallel, delayed
 
 import nibabel as nib
 import numpy as np
 from scipy.spatial import KDTree, cKDTree # pylint: disable=E0611
-from scipy.spatial.distance import cdist
-from scipy.sparse import find, csr_matrix
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 
 # pylint: disable=E0611
-from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonCore import vtkPoints, VTK_ID_TYPE
 from vtkmodules.vtkCommonDataModel import vtkPolyData, vtkCellArray
 from vtkmodules.vtkFiltersCore import vtkDecimatePro
-from vtkmodules.util.numpy_support import vtk_to_numpy
+from vtkmodules.util.numpy_support import vtk_to_numpy, numpy_to_vtk
 
 
 def _normit(vectors):
@@ -67,7 +66,7 @@ def _normit(vectors):
     Returns:
     ndarray: Normalized array of vectors where each row has unit length.
     """
-    norm_n = np.sqrt(np.sum(vectors ** 2, axis=1))
+    norm_n = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
     norm_n[norm_n < np.finfo(float).eps] = 1
     return vectors / norm_n[:, np.newaxis]
 
@@ -87,16 +86,16 @@ def mesh_normals(vertices, faces, unit=False):
            - vertex_normal: Normal vectors for each vertex.
            - face_normal: Normal vectors for each face.
     """
+    triangles = vertices[faces]
     face_normal = np.cross(
-        vertices[faces[:, 1], :] - vertices[faces[:, 0], :],
-        vertices[faces[:, 2], :] - vertices[faces[:, 0], :]
+        triangles[:, 1, :] - triangles[:, 0, :],
+        triangles[:, 2, :] - triangles[:, 0, :]
     )
     face_normal = _normit(face_normal)
 
+    # Scatter each face normal onto its three vertices, in the same order as looping over faces
     vertex_normal = np.zeros_like(vertices)
-    for i in range(len(faces)):
-        for j in range(3):
-            vertex_normal[faces[i, j], :] += face_normal[i, :]
+    np.add.at(vertex_normal, faces.ravel(), np.repeat(face_normal, 3, axis=0))
 
     centered_vertices = vertices - np.mean(vertices, axis=0)
     if np.count_nonzero(np.sign(np.sum(centered_vertices * vertex_normal, axis=1))) > \
@@ -111,7 +110,7 @@ def mesh_normals(vertices, faces, unit=False):
     return vertex_normal, face_normal
 
 
-def create_surf_gifti(vertices, faces, normals=None):
+def create_surf_gifti(vertices, faces, normals=None, copy=True):
     """
     Create a Gifti image object from surface mesh data.
 
@@ -126,6 +125,10 @@ def create_surf_gifti(vertices, faces, normals=None):
                            corresponding to vertex indices.
     normals (numpy.ndarray, optional): Array of vertex normals. Each row represents a normal vector
                                        corresponding to a vertex.
+    copy (bool, optional): Whether to copy the arrays into the Gifti image. If False, arrays that
+                           are already in the required format are not copied, so the Gifti image
+                           shares their memory; only use this for arrays that are not used or
+                           modified elsewhere. Default is True.
 
     Returns:
     nibabel.gifti.GiftiImage: The GiftiImage object created from the provided mesh data.
@@ -147,8 +150,8 @@ def create_surf_gifti(vertices, faces, normals=None):
     new_gifti = nib.gifti.GiftiImage()
 
     # Cast vertices and faces to the appropriate data types
-    vertices = vertices.astype(np.float32)
-    faces = faces.astype(np.int32)
+    vertices = vertices.astype(np.float32, copy=copy)
+    faces = faces.astype(np.int32, copy=copy)
 
     # Add the vertices and faces to the gifti object
     new_gifti.add_gifti_data_array(
@@ -166,7 +169,7 @@ def create_surf_gifti(vertices, faces, normals=None):
 
     # If normals are provided and not empty, cast them to float32 and add them to the Gifti image
     if normals is not None:
-        normals = np.array(normals).astype(np.float32)
+        normals = np.asarray(normals).astype(np.float32, copy=copy)
         new_gifti.add_gifti_data_array(
             nib.gifti.GiftiDataArray(
                 data=normals,
@@ -275,6 +278,36 @@ def remove_vertices(gifti_surf, vertices_to_remove):
     return new_gifti
 
 
+def _mesh_edges(faces):
+    """
+    Collect the unique undirected edges of a triangle mesh.
+
+    Each edge is encoded as a single integer key built from its sorted vertex indices, so that the
+    edges of all faces can be deduplicated with one sort of a flat array.
+
+    Parameters:
+    faces (np.ndarray): Non-empty array of faces, each row holding three vertex indices.
+
+    Returns:
+    tuple: A tuple containing three elements:
+        - np.ndarray: The unique edges [e, 2], with sorted vertex indices, in lexicographic order.
+        - np.ndarray: Index into the unique edges of the edges (0, 1), (1, 2) and (2, 0) of every
+                      face, as an array of shape [3, f].
+        - np.ndarray: The number of faces sharing each unique edge.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    n_vertices = faces.max() + 1
+
+    first = faces.T
+    second = faces[:, [1, 2, 0]].T
+    keys = np.minimum(first, second) * n_vertices + np.maximum(first, second)
+
+    unique_keys, edge_idx, counts = np.unique(keys.ravel(), return_inverse=True,
+                                              return_counts=True)
+    edges = np.column_stack((unique_keys // n_vertices, unique_keys % n_vertices))
+    return edges, edge_idx.reshape(keys.shape), counts
+
+
 def find_non_manifold_edges(faces):
     """
     Identifies non-manifold edges in a given mesh represented by its faces.
@@ -291,17 +324,31 @@ def find_non_manifold_edges(faces):
     dict: A dictionary where keys are tuples representing non-manifold edges (vertices indices are
           sorted), and values are lists of face indices that share the edge.
 
-    The function uses a defaultdict to collect face indices for each edge encountered in the mesh.
-    It then filters out edges that are associated with more than two faces, identifying them as
-    non-manifold.
+    Edges are collected with _mesh_edges, edges associated with more than two faces are identified
+    from the counts of unique edges, and only the faces of those edges are grouped.
     """
-    edge_faces = defaultdict(list)
-
-    for i, (vertex_1, vertex_2, vertex_3) in enumerate(faces):
-        for edge in [(vertex_1, vertex_2), (vertex_2, vertex_3), (vertex_3, vertex_1)]:
-            edge_faces[tuple(sorted(edge))].append(i)
-
-    non_manifold_edges = {edge: fcs for edge, fcs in edge_faces.items() if len(fcs) > 2}
+    faces = np.asarray(faces)
+    if faces.size == 0:
+        return {}
+
+    edges, edge_idx, counts = _mesh_edges(faces)
+    non_manifold = counts > 2
+    edge_idx = edge_idx.ravel()
+    face_idx = np.tile(np.arange(faces.shape[0]), 3)
+
+    # Keep only the face edges lying on a non-manifold edge
+    on_non_manifold = non_manifold[edge_idx]
+    edge_idx = edge_idx[on_non_manifold]
+    face_idx = face_idx[on_non_manifold]
+
+    # Group face indices by edge, in ascending face order within each edge
+    order = np.lexsort((face_idx, edge_idx))
+    edge_faces = np.split(face_idx[order], np.cumsum(counts[non_manifold])[:-1])
+
+    non_manifold_edges = {
+        tuple(edge.tolist()): edge_face_idx.tolist()
+        for edge, edge_face_idx in zip(edges[non_manifold], edge_faces)
+    }
     return non_manifold_edges
 
 
@@ -335,16 +382,16 @@ def fix_non_manifold_edges(vertices, faces):
                                    # edge
     """
 
-    non_manifold_edges = find_non_manifold_edges(faces)
-    conflicting_faces = set()
-    for faces_list in non_manifold_edges.values():
-        conflicting_faces.update(faces_list)
+    faces = np.asarray(faces, dtype=np.int32)
+    if faces.size == 0:
+        return vertices, faces
 
-    # Create a new face list excluding the conflicting faces
-    new_faces = np.array(
-        [face for i, face in enumerate(faces) if i not in conflicting_faces],
-        dtype=np.int32
-    )
+    # Flag the faces with at least one edge shared by more than two faces
+    _, edge_idx, counts = _mesh_edges(faces)
+    conflicting_faces = (counts > 2)[edge_idx].any(axis=0)
+
+    # Create a new face array excluding the conflicting faces
+    new_faces = faces[~conflicting_faces]
     return vertices, new_faces
 
 
@@ -381,16 +428,19 @@ def downsample_single_surface(gifti_surf, ds_factor=0.1):
     vertices = gifti_surf.darrays[0].data
     faces = gifti_surf.darrays[1].data
 
-    # Convert vertices and faces to a VTK PolyData object
+    # Convert vertices and faces to a VTK PolyData object. Points are stored in single precision,
+    # as vtkPoints does by default
     points = vtkPoints()
-    for point in vertices:
-        points.InsertNextPoint(point)
+    points.SetData(numpy_to_vtk(np.ascontiguousarray(vertices, dtype=np.float32), deep=True))
 
+    # Cells are given by the offset of each (triangular) face in the flattened array of face
+    # vertex indices
+    offsets = np.arange(0, faces.size + 1, 3)
     cells = vtkCellArray()
-    for face in faces:
-        cells.InsertNextCell(len(face))
-        for vertex in face:
-            cells.InsertCellPoint(vertex)
+    cells.SetData(
+        numpy_to_vtk(offsets, deep=True, array_type=VTK_ID_TYPE),
+        numpy_to_vtk(np.ravel(faces), deep=True, array_type=VTK_ID_TYPE)
+    )
 
     polydata = vtkPolyData()
     polydata.SetPoints(points)
@@ -539,6 +589,10 @@ def downsample_multiple_surfaces(in_surfs, ds_factor):
     # Save the downsampled primary surface with normals
     out_surfs.append(ds_primary_surf)
 
+    # All surfaces share the faces of the downsampled primary surface, so non-manifold edges only
+    # need to be removed once
+    _, nonmani_faces = fix_non_manifold_edges(reduced_vertices, reduced_faces)
+
     # Process other surfaces
     for i in range(1, len(in_surfs)):
         surf = in_surfs[i]
@@ -551,9 +605,7 @@ def downsample_multiple_surfaces(in_surfs, ds_factor):
 
         surf_verts=surf.darrays[0].data[orig_vert_idx, :]
 
-        nonmani_vertices, nonmani_faces = fix_non_manifold_edges(surf_verts, reduced_faces)
-
-        ds_surf = create_surf_gifti(nonmani_vertices, nonmani_faces, normals=reduced_normals)
+        ds_surf = create_surf_gifti(surf_verts, nonmani_faces, normals=reduced_normals)
 
         out_surfs.append(ds_surf)
     return out_surfs
@@ -589,44 +641,59 @@ def combine_surfaces(surfaces):
     >>> nib.save(combined_surf, 'path/to/combined_surface.gii')
     """
 
-    combined_vertices = []
-    combined_faces = []
-    combined_normals = []
-
-    face_offset = 0
+    vertex_arrays = []
+    face_arrays = []
+    normal_arrays = []
 
     for mesh in surfaces:
 
         # Extract vertices and faces
-        vertices = np.concatenate(
+        vertex_arrays.append(np.concatenate(
             [da.data for da in mesh.darrays
-             if da.intent == nib.nifti1.intent_codes['NIFTI_INTENT_POINTSET']])
-        faces = np.concatenate(
+             if da.intent == nib.nifti1.intent_codes['NIFTI_INTENT_POINTSET']]))
+        face_arrays.append(np.concatenate(
             [da.data for da in mesh.darrays
-             if da.intent == nib.nifti1.intent_codes['NIFTI_INTENT_TRIANGLE']])
+             if da.intent == nib.nifti1.intent_codes['NIFTI_INTENT_TRIANGLE']]))
 
         # Check for normals
-        normal_arrays = [da.data for da in mesh.darrays
-                         if da.intent == nib.nifti1.intent_codes['NIFTI_INTENT_VECTOR']]
-        normals = np.concatenate(normal_arrays) if normal_arrays else np.array([])
-
-        combined_vertices.append(vertices)
-        combined_faces.append(faces + face_offset)
+        surf_normals = [da.data for da in mesh.darrays
+                        if da.intent == nib.nifti1.intent_codes['NIFTI_INTENT_VECTOR']]
+        normals = np.concatenate(surf_normals) if surf_normals else np.array([])
         if normals.size:
-            combined_normals.append(normals)
+            normal_arrays.append(normals)
 
-        face_offset += vertices.shape[0]
+    # Combine the arrays into preallocated outputs, re-indexing the faces of each mesh by the
+    # number of vertices in the preceding meshes
+    combined_vertices = np.empty((sum(verts.shape[0] for verts in vertex_arrays), 3),
+                                 dtype=np.float32)
+    combined_faces = np.empty((sum(faces.shape[0] for faces in face_arrays), 3), dtype=np.int32)
 
-    # Combine the arrays
-    combined_vertices = np.vstack(combined_vertices).astype(np.float32)
-    combined_faces = np.vstack(combined_faces).astype(np.int32)
-    if combined_normals:
-        combined_normals = np.vstack(combined_normals).astype(np.float32)
+    vertex_offset = 0
+    face_offset = 0
+    for vertices, faces in zip(vertex_arrays, face_arrays):
+        n_vertices = vertices.shape[0]
+        n_faces = faces.shape[0]
+        combined_vertices[vertex_offset:vertex_offset + n_vertices, :] = vertices
+        combined_faces[face_offset:face_offset + n_faces, :] = faces
+        combined_faces[face_offset:face_offset + n_faces, :] += vertex_offset
+        vertex_offset += n_vertices
+        face_offset += n_faces
 
+    combined_normals = []
+    if normal_arrays:
+        combined_normals = np.empty((sum(normals.shape[0] for normals in normal_arrays), 3),
+                                    dtype=np.float32)
+        normal_offset = 0
+        for normals in normal_arrays:
+            combined_normals[normal_offset:normal_offset + normals.shape[0], :] = normals
+            normal_offset += normals.shape[0]
+
+    # The combined arrays are only referenced here, so the Gifti image can take them over
     combined_surf = create_surf_gifti(
         combined_vertices,
         combined_faces,
-        normals=combined_normals
+        normals=combined_normals,
+        copy=False
     )
 
     return combined_surf
@@ -992,25 +1059,24 @@ def mesh_adjacency(faces):
     faces - a numpy array of shape [f, 3] representing the mesh faces
 
     Returns:
-    adjacency - adjacency matrix as a sparse [v, v] array, where v is the number of vertices.
+    adjacency - adjacency matrix as a sparse [v, v] int8 array, where v is the number of vertices.
     """
-    faces = np.asarray(faces, dtype=int)
+    faces = np.asarray(faces, dtype=np.int32)
     n_vertices = np.max(faces)+1  # Assuming max vertex index represents the number of vertices
 
-    # Flatten the indices to create row and column indices for the adjacency matrix
-    row_indices = np.hstack([faces[:, 0], faces[:, 0], faces[:, 1],
-                             faces[:, 1], faces[:, 2], faces[:, 2]])
-    col_indices = np.hstack([faces[:, 1], faces[:, 2], faces[:, 0],
-                             faces[:, 2], faces[:, 0], faces[:, 1]])
+    # Row and column indices of both directions of every face edge
+    row_indices = faces[:, [0, 0, 1, 1, 2, 2]].ravel()
+    col_indices = faces[:, [1, 2, 0, 2, 0, 1]].ravel()
 
-    # Create a sparse matrix from row and column indices
+    # Create a sparse matrix from row and column indices (duplicate edges are summed)
     adjacency = csr_matrix(
-        (np.ones_like(row_indices), (row_indices, col_indices)),
+        (np.ones(row_indices.size, dtype=np.int8), (row_indices, col_indices)),
         shape=(n_vertices, n_vertices)
     )
+    adjacency.sum_duplicates()
 
     # Ensure the adjacency matrix is binary
-    adjacency = (adjacency > 0).astype(int)
+    adjacency.data[:] = 1
 
     return adjacency
 
@@ -1048,6 +1114,13 @@ def interpolate_data(original_mesh, downsampled_mesh, downsampled_data, adjacenc
     if adjacency_matrix is None:
         adjacency_matrix = mesh_adjacency(original_mesh.darrays[1].data)
 
+    # Neighbors of each vertex are read directly from the CSR structure of the adjacency matrix
+    adjacency_matrix = csr_matrix(adjacency_matrix, copy=True)
+    adjacency_matrix.eliminate_zeros()
+    adjacency_matrix.sort_indices()
+    indptr = adjacency_matrix.indptr
+    neighbor_indices = adjacency_matrix.indices
+
     original_vertices = original_mesh.darrays[0].data
     downsampled_vertices = downsampled_mesh.darrays[0].data
 
@@ -1057,22 +1130,26 @@ def interpolate_data(original_mesh, downsampled_mesh, downsampled_data, adjacenc
     # Preallocate the vertex data array
     vertex_data = np.full(len(original_vertices), np.nan)
 
-    # Find the nearest neighbor in the downsampled mesh for each vertex in the original mesh
-    distances, indices = tree.query(original_vertices, distance_upper_bound=1e-5)
+    # Find the nearest neighbor in the downsampled mesh for each vertex in the original mesh, with
+    # the queries split across all available cores
+    distances, indices = tree.query(original_vertices, distance_upper_bound=1e-5, n_jobs=-1)
 
     # Set the vertex data for vertices that match (distance is zero or very close)
-    for i, (distance, index) in enumerate(zip(distances, indices)):
-        if distance < 1e-6:  # Adjust this threshold as needed
-            vertex_data[i] = downsampled_data[index]
+    matched = distances < 1e-6  # Adjust this threshold as needed
+    vertex_data[matched] = np.asarray(downsampled_data)[indices[matched]]
+
+    original_vertices = original_vertices.astype(np.float64)
 
     iteration = 0
     while np.isnan(vertex_data).any() and iteration < max_iterations:
         for i in np.where(np.isnan(vertex_data))[0]:
-            _, neighbors, _ = find(adjacency_matrix[i, :])
+            neighbors = neighbor_indices[indptr[i]:indptr[i + 1]]
             valid_neighbors = neighbors[~np.isnan(vertex_data[neighbors])]
 
             if valid_neighbors.size > 0:
-                distances = cdist([original_vertices[i]], original_vertices[valid_neighbors])[0]
+                distances = np.sqrt(np.sum(
+                    (original_vertices[valid_neighbors] - original_vertices[i]) ** 2, axis=1
+                ))
                 weights = 1 / distances
                 normalized_weights = weights / weights.sum()
                 vertex_data[i] = np.dot(normalized_weights, vertex_data[valid_neighbors])
@@ -1105,24 +1182,29 @@ def split_fv(faces, vertices):
           location.
     """
     num_faces = faces.shape[0]
-    f_sets = np.zeros(num_faces, dtype=np.uint32)
-    current_set = 0
+    if num_faces == 0:
+        return []
+
+    # Faces are connected if they share a vertex: build the face-face graph from the
+    # vertex-face incidence matrix and label its connected components
+    vertex_face = csr_matrix(
+        (np.ones(faces.size, dtype=np.int32),
+         (faces.ravel(), np.repeat(np.arange(num_faces), faces.shape[1]))),
+        shape=(int(np.max(faces)) + 1, num_faces)
+    )
+    current_set, labels = connected_components(vertex_face.T @ vertex_face, directed=False)
 
-    while np.any(f_sets == 0):
-        current_set += 1
-        next_avail_face = np.where(f_sets == 0)[0][0]
-        open_vertices = faces[next_avail_face]
+    # Number the sets from 1, in order of their first face
+    _, first_faces = np.unique(labels, return_index=True)
+    f_sets = np.argsort(np.argsort(first_faces))[labels] + 1
 
-        while open_vertices.size:
-            avail_face_inds = np.where(f_sets == 0)[0]
-            is_member = np.isin(faces[avail_face_inds], open_vertices)
-            avail_face_sub = np.where(np.any(is_member, axis=1))[0]
-            f_sets[avail_face_inds[avail_face_sub]] = current_set
-            open_vertices = np.unique(faces[avail_face_inds[avail_face_sub]])
+    # Group the faces of each set with a single stable sort, keeping their original order
+    set_order = np.argsort(f_sets, kind='stable')
+    set_sizes = np.bincount(f_sets, minlength=current_set + 1)[1:]
+    set_faces = np.split(faces[set_order], np.cumsum(set_sizes)[:-1])
 
     fv_out = []
-    for set_num in range(1, current_set + 1):
-        set_f = faces[f_sets == set_num]
+    for set_f in set_faces:
         unique_vertices, new_vertex_indices = np.unique(set_f, return_inverse=True)
         fv_out.append({
             'faces': new_vertex_indices.reshape(set_f.shape),
@@ -16,6 +16,7 @@ import csv
 import json
 import os
 import tempfile
+from functools import lru_cache
 from pathlib import Path
 from contextlib import contextmanager
 
@@ -28,6 +29,21 @@ from scipy.stats import t
 import spm_standalone
 
 
+@lru_cache(maxsize=None)
+def _load_settings():
+    """
+    Load the package settings file.
+
+    The settings are read from disk once and cached for subsequent calls.
+
+    Returns:
+    dict: Package settings (e.g. the number of parallel workers used by standalone SPM).
+    """
+    settings_fname = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.json')
+    with open(settings_fname, 'r', encoding="utf-8") as settings_file:
+        return json.load(settings_file)
+
+
 @contextmanager
 def spm_context(spm=None):
     """
@@ -46,13 +62,10 @@ def spm_context(spm=None):
     - This function is intended for use in a 'with' statement to ensure proper management of
       standalone SPM resources.
     """
-    # Start standalone SPM
-    settings_fname = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.json')
-    with open(settings_fname, 'r', encoding="utf-8") as settings_file:
-        parameters = json.load(settings_file)
-
     close_spm = False
     if spm is None:
+        # Start standalone SPM
+        parameters = _load_settings()
         spm = spm_standalone.initialize()
         spm.spm_standalone(
             "eval",
@@ -332,10 +345,7 @@ def check_many(multiple, target, func=None):
         use_func = func_dict[func]
     else:
         raise ValueError("pick function 'all' or 'any'")
-    check_ = []
-    for i in multiple:
-        check_.append(i in target)
-    return use_func(check_)
+    return use_func(i in target for i in multiple)
 
 
 def get_files(target_path, suffix, strings=(""), prefix=None, check="all", depth="all"):
@@ -608,21 +618,26 @@ def big_brain_proportional_layer_boundaries(overwrite=False):
     
     Function uses the included fsaverage converted Big Brain cortical thickness atlas to calculate
     normalised distances between cortical layer (from layer 1 to layer 6) boundaries (values
-    between 0 and 1). To speed up the computation, the results are stored in the numpy dictionary.
+    between 0 and 1). To speed up the computation, the results are stored in one numpy file per
+    hemisphere, which are memory-mapped rather than read into memory when loaded.
     
     Parameters:
     overwrite (bool): overwrite the existing file
     
     Returns:
     bb_data (dict): dictionary (keys: "lh", "rh") with arrays containing layer boundaries for each
-                    vertex in the hemisphere
+                    vertex in the hemisphere. The arrays are read-only memory maps of the stored
+                    files, whether or not they were just computed; copy them to modify them.
     
     """
 
     asset_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), './assets')
 
-    bbl_file = os.path.join(asset_path, "proportional_layer_boundaries.npy")
-    if any([not os.path.exists(bbl_file), overwrite]):
+    bbl_files = {
+        hemi: os.path.join(asset_path, f"proportional_layer_boundaries_{hemi}.npy")
+        for hemi in ["lh", "rh"]
+    }
+    if any([not all(os.path.exists(fname) for fname in bbl_files.values()), overwrite]):
         bb_l_paths = get_files(asset_path, "*.gii", strings=["tpl-fsaverage", "hemi-L"])
         bb_l_paths.sort()
         bb_r_paths = get_files(asset_path, "*.gii", strings=["tpl-fsaverage", "hemi-R"])
@@ -635,10 +650,19 @@ def big_brain_proportional_layer_boundaries(overwrite=False):
         bb_data = {
            key: np.apply_along_axis(calc_prop, 0, value) for key, value in bb_data.items()
         }
-        np.save(bbl_file, bb_data)
-        return bb_data
-
-    bb_data = np.load(bbl_file, allow_pickle=True).item()
+        # Write to a temporary file and move it into place, so that arrays still mapping a
+        # previous version of the file are not truncated
+        for hemi, fname in bbl_files.items():
+            tmp_fname = f"{os.path.splitext(fname)[0]}.tmp.npy"
+            np.save(tmp_fname, bb_data[hemi])
+            os.replace(tmp_fname, fname)
+
+        # Remove the single-file cache written by earlier versions
+        legacy_file = os.path.join(asset_path, "proportional_layer_boundaries.npy")
+        if os.path.exists(legacy_file):
+            os.remove(legacy_file)
+
+    bb_data = {hemi: np.load(fname, mmap_mode='r') for hemi, fname in bbl_files.items()}
     return bb_data
 
 
@@ -670,12 +694,41 @@ def get_bigbrain_layer_boundaries(subj_id, subj_surf_dir, subj_coord):
     # compute or read (if the precomputed atlas is present)
     bb_prop = big_brain_proportional_layer_boundaries()
 
-    # get the layer boundaries from the fsaverage vertex
-    vert_bb_prop = bb_prop[hemi][:,fsave_v_idx]
+    # get the layer boundaries from the fsaverage vertex (copied out of the read-only memory map)
+    vert_bb_prop = np.array(bb_prop[hemi][:,fsave_v_idx])
 
     return vert_bb_prop
 
 
+@lru_cache(maxsize=8)
+def _load_fiducials(fname, mtime):  # pylint: disable=W0613
+    """
+    Parse the fiducial coordinates of all subjects in a tab-separated values (TSV) file.
+
+    The parsed file is cached, keyed on its absolute path and modification time, so that the file
+    is only read again if it changes.
+
+    Parameters:
+    fname (str): Absolute path to the TSV file.
+    mtime (float): Modification time of the file.
+
+    Returns:
+    dict: The NAS, LPA, and RPA coordinates (tuples of floats) of each subject ID in the file.
+    """
+    fiducials = {}
+    with open(fname, 'r', encoding="utf-8") as file:
+        reader = csv.DictReader(file, delimiter='\t')
+        for row in reader:
+            # Keep the first row of each subject
+            if row['subj_id'] not in fiducials:
+                fiducials[row['subj_id']] = (
+                    tuple(float(i) for i in row['nas'].split(',')),
+                    tuple(float(i) for i in row['lpa'].split(',')),
+                    tuple(float(i) for i in row['rpa'].split(','))
+                )
+    return fiducials
+
+
 def get_fiducial_coords(subj_id, fname):
     """
     Fetches fiducial coordinates from a tab-separated values (TSV) file for a given subject ID.
@@ -687,13 +740,10 @@ def get_fiducial_coords(subj_id, fname):
     Returns:
     tuple: A tuple containing the NAS, LPA, and RPA coordinates as lists of floats.
     """
-    with open(fname, 'r', encoding="utf-8") as file:
-        reader = csv.DictReader(file, delimiter='\t')
-        for row in reader:
-            if row['subj_id'] == subj_id:
-                nas = [float(i) for i in row['nas'].split(',')]
-                lpa = [float(i) for i in row['lpa'].split(',')]
-                rpa = [float(i) for i in row['rpa'].split(',')]
-                return nas, lpa, rpa
+    fname = os.path.abspath(fname)
+    fiducials = _load_fiducials(fname, os.path.getmtime(fname))
+    if subj_id in fiducials:
+        nas, lpa, rpa = fiducials[subj_id]
+        return list(nas), list(lpa), list(rpa)
 
     return None, None, None  # Return None for each if no matching subj_id is found
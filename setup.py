@@ -6,6 +6,7 @@ import shutil
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from setuptools import setup, find_packages
 from setuptools.command.install import install
@@ -27,28 +28,48 @@ class CustomInstall(install):
         Executes the custom installation process.
 
         This method runs the standard installation, installs additional components like
-        SPM and MATLAB runtime, sets environment variables, and sets up Jupyter extensions.
+        SPM and MATLAB runtime, sets environment variables, and sets up Jupyter extensions. The
+        SPM repository is cloned in the background while the standard installation runs, as the
+        two steps do not depend on each other.
         """
-        self.clone_and_install_spm()
-        super().run()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            spm_clone = executor.submit(self.clone_spm)
+            super().run()
+            clone_dir = spm_clone.result()
+        self.install_spm(clone_dir)
         self.setup_jupyter_extensions()
 
 
-    def clone_and_install_spm(self):
+    @staticmethod
+    def clone_spm():
         """
-        Clones the SPM repository and installs it.
+        Clones the SPM repository.
 
-        This method clones the DANC_spm_python repository from GitHub, then installs it using pip.
+        This method clones the DANC_spm_python repository from GitHub. Only the latest revision is
+        fetched, since the clone is deleted once installed.
+
+        Returns:
+        str: Path to the cloned repository.
         """
         repo_url = "https://github.com/danclab/DANC_spm_python.git"
         clone_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'DANC_spm_python')
 
         if not os.path.exists(clone_dir):
             print(f"Cloning SPM repository from {repo_url}...")
-            subprocess.check_call(['git', 'clone', repo_url, clone_dir])
+            subprocess.check_call(['git', 'clone', '--depth', '1', repo_url, clone_dir])
         else:
             print("SPM repository already exists, skipping cloning.")
+        return clone_dir
+
 
+    @staticmethod
+    def install_spm(clone_dir):
+        """
+        Installs the cloned SPM repository using pip, then removes the clone.
+
+        Parameters:
+        clone_dir (str): Path to the cloned DANC_spm_python repository.
+        """
         print("Installing SPM package...")
         try:
             # Use the pip associated with the current Python interpreter
@@ -1,7 +1,6 @@
 """
 This module contains the unit tests for the `surf` module from the `lameg` package.
 """
-import copy
 import os
 import shutil
 import subprocess
@@ -21,11 +20,31 @@ from lameg.surf import split_fv, mesh_adjacency, fix_non_manifold_edges, \
 from lameg.util import make_directory
 # pylint: disable=C0302
 
+# Small meshes shared by parametrized test cases
+SQUARE_VERTICES = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+SQUARE_FACES = np.array([[0, 1, 2], [0, 2, 3]], dtype=np.int32)
+TRIANGLE_FACES = np.array([[0, 1, 2]], dtype=np.int32)
+NON_MANIFOLD_FACES = np.array([[0, 1, 2], [1, 2, 3], [2, 3, 4], [4, 1, 2]], dtype=np.int32)
+EMPTY_FACES = np.array([], dtype=np.int32)
+
 def assert_sparse_equal(actual, expected):
     """
     Helper function to assert that two sparse matrices are equal.
+
+    Both matrices are converted to canonical CSR form (no duplicate or explicitly stored zero
+    entries, sorted indices) and their structure and values are compared directly.
     """
-    assert (actual != expected).nnz == 0, "Sparse matrices are not equal"
+    actual = csr_matrix(actual, copy=True)
+    expected = csr_matrix(expected, copy=True)
+    for matrix in (actual, expected):
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+        matrix.sort_indices()
+
+    assert actual.shape == expected.shape, "Sparse matrices are not equal"
+    assert np.array_equal(actual.indptr, expected.indptr), "Sparse matrices are not equal"
+    assert np.array_equal(actual.indices, expected.indices), "Sparse matrices are not equal"
+    assert np.array_equal(actual.data, expected.data), "Sparse matrices are not equal"
 
 
 @pytest.mark.parametrize("vectors, expected", [
@@ -102,14 +121,14 @@ def test_mesh_normals(unit):
 
 @pytest.mark.parametrize("vertices, faces, normals, expect_normals", [
     # Test case with normals
-    (np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32),
-     np.array([[0, 1, 2], [0, 2, 3]], dtype=np.int32),
+    (SQUARE_VERTICES,
+     SQUARE_FACES,
      np.array([[0, 0, 1], [0, 0, 1], [0, 0, 1], [0, 0, 1]], dtype=np.float32),
      True),
 
     # Test case without normals
-    (np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32),
-     np.array([[0, 1, 2], [0, 2, 3]], dtype=np.int32),
+    (SQUARE_VERTICES,
+     SQUARE_FACES,
      None,
      False)
 ])
@@ -148,7 +167,28 @@ def test_create_surf_gifti(vertices, faces, normals, expect_normals):
         )
 
 
-@pytest.fixture
+@pytest.mark.parametrize("copy", [True, False])
+def test_create_surf_gifti_copy(copy):
+    """
+    Tests that create_surf_gifti copies the input arrays by default, so that later in-place edits
+    of the inputs do not change the Gifti image, and that it shares their memory when copy=False.
+    """
+    vertices = SQUARE_VERTICES.copy()
+    faces = SQUARE_FACES.copy()
+    normals = np.ones_like(vertices)
+    gifti_img = create_surf_gifti(vertices, faces, normals=normals, copy=copy)
+
+    for data_array, array in zip(gifti_img.darrays, [vertices, faces, normals]):
+        assert np.shares_memory(data_array.data, array) == (not copy)
+
+    vertices += 1
+    np.testing.assert_array_equal(
+        gifti_img.darrays[0].data,
+        vertices if not copy else SQUARE_VERTICES
+    )
+
+
+@pytest.fixture(scope="module")
 def connected_gifti():
     """
     Provides a GiftiImage fixture with all vertices connected to faces.
@@ -159,12 +199,12 @@ def connected_gifti():
     Returns:
     nibabel.gifti.GiftiImage: A GiftiImage object where all vertices are connected.
     """
-    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
-    faces = np.array([[0, 1, 2], [0, 2, 3]])
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+    faces = np.array([[0, 1, 2], [0, 2, 3]], dtype=np.int32)
     return create_surf_gifti(vertices, faces)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def unconnected_gifti():
     """
     Provides a GiftiImage fixture with some vertices unconnected to any faces.
@@ -175,8 +215,8 @@ def unconnected_gifti():
     Returns:
     nibabel.gifti.GiftiImage: A GiftiImage object with some unconnected vertices.
     """
-    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 2, 2]])
-    faces = np.array([[0, 1, 2], [0, 2, 3]])
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 2, 2]], dtype=np.float32)
+    faces = np.array([[0, 1, 2], [0, 2, 3]], dtype=np.int32)
     return create_surf_gifti(vertices, faces)
 
 
@@ -233,7 +273,7 @@ def test_remove_unconnected_vertices_edge_case():
     assert len(result.darrays[0].data) == 3
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_gifti():
     """
     Pytest fixture that creates a simple GiftiImage object suitable for testing.
@@ -245,9 +285,9 @@ def sample_gifti():
     Returns:
         nibabel.gifti.GiftiImage: A GiftiImage object with predefined vertices and faces.
     """
-    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
-    faces = np.array([[0, 1, 2], [0, 2, 3]])
-    normals = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 0, 0]])
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+    faces = np.array([[0, 1, 2], [0, 2, 3]], dtype=np.int32)
+    normals = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 0, 0]], dtype=np.float32)
     return create_surf_gifti(vertices, faces, normals=normals)
 
 
@@ -310,10 +350,10 @@ def test_edge_case_removal(sample_gifti):
 
 @pytest.mark.parametrize("faces, expected_result", [
     # No non-manifold edges: Simple triangle
-    (np.array([[0, 1, 2]]), {}),
+    (TRIANGLE_FACES, {}),
 
     # Complex case with multiple overlapping edges
-    (np.array([[0, 1, 2], [1, 2, 3], [2, 3, 4], [4, 1, 2]]), {(1, 2): [0, 1, 3]}),
+    (NON_MANIFOLD_FACES, {(1, 2): [0, 1, 3]}),
 ])
 def test_find_non_manifold_edges(faces, expected_result):
     """
@@ -330,17 +370,17 @@ def test_find_non_manifold_edges(faces, expected_result):
 @pytest.mark.parametrize("vertices, faces, expected_faces", [
     # Case 1: Single triangle, no non-manifold edges
     (np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]]),
-     np.array([[0, 1, 2]]),
+     TRIANGLE_FACES,
      np.array([[0, 1, 2]])),
 
     # Case 3: Complex mesh with one non-manifold edge
     (np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0.5, 0.5, 0]]),
-     np.array([[0, 1, 2], [1, 2, 3], [2, 3, 4], [4, 1, 2]]),
+     NON_MANIFOLD_FACES,
      np.array([[2, 3, 4]])),
 
     # Case 4: Mesh without any faces (should handle gracefully)
-    (np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]),
-     np.array([]),
+    (SQUARE_VERTICES,
+     EMPTY_FACES,
      np.array([]))
 ])
 def test_fix_non_manifold_edges(vertices, faces, expected_faces):
@@ -361,44 +401,43 @@ def test_fix_non_manifold_edges(vertices, faces, expected_faces):
     np.testing.assert_array_equal(actual_faces, expected_faces)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def large_gifti():
     """
     Provides a large GiftiImage fixture with a dense mesh of vertices and faces.
 
     This fixture is designed for testing functions that operate on complex, high-resolution
     neuroimaging surface data. It simulates a realistic scenario where a mesh might include
-    thousands of vertices and faces, typical of high-resolution brain scans.
+    thousands of vertices and faces, typical of high-resolution brain scans. The mesh is built once
+    per session and shared between tests, so tests must copy its data arrays before modifying them.
 
     Returns:
     nibabel.gifti.GiftiImage: A GiftiImage object representing a dense mesh.
     """
     # Create a large number of vertices arranged in a grid
     num_vertices_side = 100  # Creates a 100x100 grid of vertices
-    vertices = np.array([[x_coord, y_coord, np.sin(x_coord) * np.cos(y_coord)]
-                         for x_coord in range(num_vertices_side)
-                         for y_coord in range(num_vertices_side)])
-    normals = np.array([[x_coord, y_coord, -1*np.sin(x_coord) + 3*np.cos(y_coord)]
-                         for x_coord in range(num_vertices_side)
-                         for y_coord in range(num_vertices_side)])
-
-    # Create faces using the grid of vertices
-    faces = []
-    for x_idx in range(num_vertices_side - 1):
-        for y_idx in range(num_vertices_side - 1):
-            # Each square in the grid is divided into two triangles
-            top_left = x_idx * num_vertices_side + y_idx
-            top_right = top_left + 1
-            bottom_left = top_left + num_vertices_side
-            bottom_right = bottom_left + 1
-
-            faces.append([top_left, bottom_left, top_right])  # First triangle
-            faces.append([bottom_left, bottom_right, top_right])  # Second triangle
-
-    # Convert lists to numpy arrays
-    vertices = np.array(vertices)
-    faces = np.array(faces)
-    normals = np.array(normals)
+    x_coords, y_coords = np.meshgrid(np.arange(num_vertices_side), np.arange(num_vertices_side),
+                                     indexing='ij')
+    vertices = np.stack([x_coords, y_coords, np.sin(x_coords) * np.cos(y_coords)],
+                        axis=-1).reshape(-1, 3).astype(np.float32)
+    normals = np.stack([x_coords, y_coords, -1*np.sin(x_coords) + 3*np.cos(y_coords)],
+                       axis=-1).reshape(-1, 3).astype(np.float32)
+
+    # Create faces using the grid of vertices, each square divided into two triangles
+    top_left = (x_coords[:-1, :-1] * num_vertices_side + y_coords[:-1, :-1]).ravel()
+    top_right = top_left + 1
+    bottom_left = top_left + num_vertices_side
+    bottom_right = bottom_left + 1
+
+    faces = np.empty((2 * top_left.size, 3), dtype=np.int32)
+    # First triangle
+    faces[0::2, 0] = top_left
+    faces[0::2, 1] = bottom_left
+    faces[0::2, 2] = top_right
+    # Second triangle
+    faces[1::2, 0] = bottom_left
+    faces[1::2, 1] = bottom_right
+    faces[1::2, 2] = top_right
 
     # Create the GiftiImage
     gii = create_surf_gifti(vertices, faces, normals=normals)
@@ -406,6 +445,27 @@ def large_gifti():
     return gii
 
 
+# pylint: disable=W0621
+@pytest.fixture(scope="session")
+def large_gifti2(large_gifti):
+    """
+    Provides a copy of the large_gifti mesh with its vertices shifted by 5 along the z-axis.
+
+    The faces and normals are those of large_gifti, so the two surfaces share the same topology,
+    as the layers of a laminar surface set do.
+
+    Returns:
+    nibabel.gifti.GiftiImage: A GiftiImage object representing the shifted dense mesh.
+    """
+    verts2 = large_gifti.darrays[0].data + np.array([0, 0, 5],
+                                                    dtype=large_gifti.darrays[0].data.dtype)
+    return create_surf_gifti(
+        verts2,
+        large_gifti.darrays[1].data,
+        normals=large_gifti.darrays[2].data
+    )
+
+
 # pylint: disable=W0621
 def test_downsample_single_surface(large_gifti):
     """
@@ -436,15 +496,15 @@ def test_downsample_single_surface(large_gifti):
     target = np.array([[ 0.,  1.,  0.], [ 0.,  6.,  0.], [ 0.,  9., -0.], [ 0., 21., -0.],
                        [ 0., 31.,  0.], [ 0., 41., -0.], [ 0., 43.,  0.], [ 0., 53., -0.],
                        [ 0., 68.,  0.], [ 0., 75.,  0.]])
-    assert np.allclose(ds_gifti.darrays[0].data[:10,:], target)
+    np.testing.assert_allclose(ds_gifti.darrays[0].data[:10,:], target, rtol=1e-5, atol=1e-8)
     target = np.array([[  12,   13,    0], [1834,    1, 1717], [  16,   27, 1004],
                        [1628,    3, 1627], [2851,   60, 2818], [  60, 1805, 2818],
                        [1361, 2618, 2387], [1001,   17,    4], [2074,   37,  998],
                        [  37, 1620,  998]])
-    assert np.allclose(ds_gifti.darrays[1].data[:10,:], target)
+    np.testing.assert_array_equal(ds_gifti.darrays[1].data[:10,:], target)
     target = np.array([[ 0., 1., 1.620907 ], [ 0., 6., 2.8805108], [ 0., 9., -2.7333908],
                        [ 0., 21., -1.6431878], [ 0., 31., 2.7442272]])
-    assert np.allclose(ds_gifti.darrays[2].data[:5, :], target)
+    np.testing.assert_allclose(ds_gifti.darrays[2].data[:5, :], target, rtol=1e-5, atol=1e-8)
 
 
 # pylint: disable=W0621
@@ -480,16 +540,16 @@ def test_iterative_downsample_single_surface(large_gifti):
     target = np.array([[ 0., 9., -0.], [ 0., 21., -0.], [ 0., 43., 0.], [ 0., 68., 0.],
                        [ 0., 75., 0.], [ 1., 0., 0.84147096], [ 1., 3., -.83305],
                        [ 1., 12., 0.71008], [1., 65., -0.47329], [1., 94., 0.81577]])
-    assert np.allclose(ds_gifti.darrays[0].data[:10,:], target)
+    np.testing.assert_allclose(ds_gifti.darrays[0].data[:10,:], target, rtol=1e-5, atol=1e-8)
     target = np.array([[ 603,    1,  602], [  17,  656, 1015], [ 501,  941,  865],
                        [ 596, 1153,    8], [ 610,   11,    4], [ 771, 1117, 1118],
                        [ 945,  946,  947], [ 750,  951,  907], [ 972,  670,    0],
                        [ 752,  678,    7]])
-    assert np.allclose(ds_gifti.darrays[1].data[:10,:], target)
+    np.testing.assert_array_equal(ds_gifti.darrays[1].data[:10,:], target)
 
 
 # pylint: disable=W0621
-def test_downsample_multiple_surfaces(large_gifti):
+def test_downsample_multiple_surfaces(large_gifti, large_gifti2):
     """
     Test the downsampling of multiple surface meshes represented as Gifti files.
 
@@ -502,11 +562,10 @@ def test_downsample_multiple_surfaces(large_gifti):
 
     Parameters:
     - large_gifti (GiftiImage): A GiftiImage object that represents a 3D surface mesh.
+    - large_gifti2 (GiftiImage): The same mesh with its z-coordinates shifted, simulating a
+      different but related surface.
 
     Processes:
-    - Copies the vertex data from the original surface and modifies the z-coordinates.
-    - Creates a new GiftiImage with the modified vertices to simulate a different but related
-      surface.
     - Applies downsampling to both the original and modified surfaces.
     - Checks the vertex data and face data of the resulting downsampled surfaces against expected
       targets.
@@ -523,42 +582,34 @@ def test_downsample_multiple_surfaces(large_gifti):
     - AssertionError: If any of the assertions fail, indicating discrepancies in the downsampling
       process or input modifications.
     """
-    verts2 = copy.copy(large_gifti.darrays[0].data)
-    verts2[:,2] = verts2[:,2]+5
-    large_gifti2 = create_surf_gifti(
-        verts2,
-        large_gifti.darrays[1].data,
-        normals=large_gifti.darrays[2].data
-    )
-
     ds_surfs = downsample_multiple_surfaces([large_gifti, large_gifti2], 0.1)
 
     target = np.array([[ 0.,  9., -0.], [ 0., 21., -0.], [ 0., 43.,  0.], [ 0., 68.,  0.],
                        [ 0., 75.,  0.]])
-    assert np.allclose(ds_surfs[0].darrays[0].data[:5,:], target)
+    np.testing.assert_allclose(ds_surfs[0].darrays[0].data[:5,:], target, rtol=1e-5, atol=1e-8)
 
     target = np.array([[ 0.,  9.,  5.], [ 0., 21.,  5.], [ 0., 43.,  5.], [ 0., 68.,  5.],
                        [ 0., 75.,  5.]])
-    assert np.allclose(ds_surfs[1].darrays[0].data[:5, :], target)
+    np.testing.assert_allclose(ds_surfs[1].darrays[0].data[:5, :], target, rtol=1e-5, atol=1e-8)
 
     target = np.array([[ 603,    1,  602], [  17,  656, 1015], [ 501,  941,  865],
                        [ 596, 1153,    8], [ 610,   11,    4]])
-    assert np.allclose(ds_surfs[0].darrays[1].data[:5,:], target)
+    np.testing.assert_array_equal(ds_surfs[0].darrays[1].data[:5,:], target)
 
     target = np.array([[ 0., 9., -2.7333908], [ 0., 21., -1.6431878], [ 0., 43., 1.66534  ],
                        [ 0., 68., 1.3204291], [ 0., 75., 2.7652538]])
-    assert np.allclose(ds_surfs[0].darrays[2].data[:5, :], target)
+    np.testing.assert_allclose(ds_surfs[0].darrays[2].data[:5, :], target, rtol=1e-5, atol=1e-8)
 
     target = np.array([[0., 9., -2.7333908], [0., 21., -1.6431878], [0., 43., 1.66534],
                        [0., 68., 1.3204291], [0., 75., 2.7652538]])
-    assert np.allclose(ds_surfs[1].darrays[2].data[:5, :], target)
+    np.testing.assert_allclose(ds_surfs[1].darrays[2].data[:5, :], target, rtol=1e-5, atol=1e-8)
 
     assert ds_surfs[0].darrays[0].data.shape[0] == ds_surfs[1].darrays[0].data.shape[0]
-    assert np.allclose(ds_surfs[0].darrays[1].data, ds_surfs[1].darrays[1].data)
+    np.testing.assert_array_equal(ds_surfs[0].darrays[1].data, ds_surfs[1].darrays[1].data)
 
 
 # pylint: disable=W0621
-def test_combine_surfaces(large_gifti):
+def test_combine_surfaces(large_gifti, large_gifti2):
     """
     Test the combination of multiple surface meshes into a single surface mesh.
 
@@ -571,11 +622,9 @@ def test_combine_surfaces(large_gifti):
 
     Parameters:
     - large_gifti (GiftiImage): A GiftiImage object representing a 3D surface mesh.
+    - large_gifti2 (GiftiImage): The same mesh with its z-coordinates shifted.
 
     Processes:
-    - Copies the vertex data from the original surface and modifies the z-coordinates to create a
-      variation.
-    - Constructs a new GiftiImage with these modified vertices.
     - Combines the original and modified meshes into a single composite mesh.
     - Validates that the vertex and face data in the combined surface mesh matches the concatenated
       data of the two individual meshes.
@@ -590,47 +639,89 @@ def test_combine_surfaces(large_gifti):
     - AssertionError: If any of the assertions fail, it indicates an error in the surface
       combination process or an inconsistency in data manipulation prior to combining.
     """
-    verts2 = copy.copy(large_gifti.darrays[0].data)
-    verts2[:, 2] = verts2[:, 2] + 5
-    large_gifti2 = create_surf_gifti(
-        verts2,
-        large_gifti.darrays[1].data,
-        normals=large_gifti.darrays[2].data
-    )
-
     combined_surf = combine_surfaces([large_gifti, large_gifti2])
 
     target = np.vstack([
         large_gifti.darrays[0].data,
         large_gifti2.darrays[0].data
     ])
-    assert np.allclose(combined_surf.darrays[0].data, target)
+    np.testing.assert_allclose(combined_surf.darrays[0].data, target, rtol=1e-5, atol=1e-8)
 
     target = np.vstack([
         large_gifti.darrays[1].data,
         large_gifti2.darrays[1].data+large_gifti.darrays[0].data.shape[0]
     ])
-    assert np.allclose(combined_surf.darrays[1].data, target)
+    np.testing.assert_array_equal(combined_surf.darrays[1].data, target)
 
     target = np.vstack([
         large_gifti.darrays[2].data,
         large_gifti2.darrays[2].data
     ])
-    assert np.allclose(combined_surf.darrays[2].data, target)
+    np.testing.assert_allclose(combined_surf.darrays[2].data, target, rtol=1e-5, atol=1e-8)
+
+
+# pylint: disable=W0621
+@pytest.fixture(scope="module")
+def dipole_surf_dir(large_gifti, large_gifti2, tmp_path_factory):
+    """
+    Saves pial and white matter surfaces, and their downsampled versions, for testing
+    compute_dipole_orientations.
 
+    The pial surface is built from the vertices and faces of large_gifti2 (large_gifti shifted
+    along the z-axis), without normals, and large_gifti is used as the white matter surface. Both
+    surfaces are downsampled together and all four surfaces are saved once, in a temporary
+    directory, to be shared by every method tested.
 
+    Returns:
+    str: The temporary directory containing the saved surfaces.
+    """
+    surf_dir = str(tmp_path_factory.mktemp('surf'))
+
+    nib.save(large_gifti, os.path.join(surf_dir, 'white.gii'))
+
+    pial = create_surf_gifti(large_gifti2.darrays[0].data, large_gifti2.darrays[1].data)
+    nib.save(pial, os.path.join(surf_dir, 'pial.gii'))
+
+    ds_surfs = downsample_multiple_surfaces([pial, large_gifti], 0.1)
+    nib.save(ds_surfs[0], os.path.join(surf_dir, 'pial.ds.gii'))
+    nib.save(ds_surfs[1], os.path.join(surf_dir, 'white.ds.gii'))
+
+    return surf_dir
+
+
+@pytest.mark.parametrize("method, target", [
+    ('link_vector', np.array([[ 0.,  0., -1.], [ 0.,  0., -1.], [ 0.,  0. ,-1.], [ 0.,  0., -1.],
+                              [ 0.,  0., -1.], [ 0.,  0., -1.], [ 0.,  0., -1.], [ 0.,  0., -1.],
+                              [ 0.,  0., -1.], [ 0.,  0., -1.]])),
+    ('ds_surf_norm', np.array([[-0.04698259,  0.1540498,  -0.98694545],
+                               [-0.07900448,  0.12416247, -0.9891117 ],
+                               [ 0.05659738,  0.10748,    -0.99259496],
+                               [-0.11056121, -0.07688656, -0.99089086],
+                               [-0.04565653,  0.14132655, -0.9889096 ]])),
+    ('orig_surf_norm', np.array([[ 0.4929678,  -0.1130688, -0.8626692 ],
+                                 [-0.4485411,  -0.16056265, -0.87922156],
+                                 [-0.16060773, -0.21938397 ,-0.9623283 ],
+                                 [ 0.16595066,  0.21885467, -0.961542  ],
+                                 [ 0.08390685,  0.22491537, -0.97075886]])),
+    ('cps', np.array([[ 1.8139431e-01, -2.7962229e-01 ,-9.4281888e-01],
+                      [-1.0353364e-02, -7.2763674e-02, -9.9729550e-01],
+                      [ 3.1780198e-04, -1.1128817e-01 ,-9.9378812e-01],
+                      [-1.8438324e-02, -1.2312002e-02, -9.9975419e-01],
+                      [ 7.1880430e-02,  1.5277593e-01, -9.8564333e-01]])),
+])
 # pylint: disable=W0621
-def test_compute_dipole_orientations(large_gifti):
+def test_compute_dipole_orientations(dipole_surf_dir, method, target):
     """
     Test the compute_dipole_orientations function for different methods to ensure correct
     calculation of dipole orientations across various scenarios.
 
     Steps:
-    1. Create two slightly different surface files by modifying vertex coordinates.
-    2. Downsample both surfaces and save them.
-    3. Compute dipole orientations for the 'link_vector', 'ds_surf_norm', 'orig_surf_norm',
+    1. Use the pial and white matter surfaces, and their downsampled versions, saved by the
+       dipole_surf_dir fixture.
+    2. Compute dipole orientations for the 'link_vector', 'ds_surf_norm', 'orig_surf_norm',
        and 'cps' methods.
-    4. Verify the orientations against predefined expected outcomes for each method.
+    3. Verify the orientations of the first vertices of both layers against predefined expected
+       outcomes for each method.
 
     The test checks:
     - That the function handles the creation of link vectors correctly by comparing the
@@ -645,75 +736,16 @@ def test_compute_dipole_orientations(large_gifti):
     typical usage scenarios and ensures that any changes to the underlying implementation
     maintain the expected behavior.
     """
-    _ = make_directory('./', ['output'])
-
-    nib.save(large_gifti, os.path.join('./output/white.gii'))
-
-    verts2 = copy.copy(large_gifti.darrays[0].data)
-    verts2[:, 2] = verts2[:, 2] + 5
-    large_gifti2 = create_surf_gifti(verts2, large_gifti.darrays[1].data)
-    nib.save(large_gifti2, os.path.join('./output/pial.gii'))
-
-    ds_surfs = downsample_multiple_surfaces([large_gifti2, large_gifti], 0.1)
-    nib.save(ds_surfs[0], './output/pial.ds.gii')
-    nib.save(ds_surfs[1], './output/white.ds.gii')
-
     normals = compute_dipole_orientations(
-        'link_vector',
-        ['pial','white'],
-        './output',
-        fixed=True
-    )
-    target = np.array([[ 0.,  0., -1.], [ 0.,  0., -1.], [ 0.,  0. ,-1.], [ 0.,  0., -1.],
-                       [ 0.,  0., -1.], [ 0.,  0., -1.], [ 0.,  0., -1.], [ 0.,  0., -1.],
-                       [ 0.,  0., -1.], [ 0.,  0., -1.]])
-    assert np.allclose(normals[0,:10,:], target)
-    assert np.allclose(normals[1,:10,:], target)
-
-    normals = compute_dipole_orientations(
-        'ds_surf_norm',
+        method,
         ['pial', 'white'],
-        './output',
+        dipole_surf_dir,
         fixed=True
     )
 
-    target = np.array([[-0.04698259,  0.1540498,  -0.98694545],
-                       [-0.07900448,  0.12416247, -0.9891117 ],
-                       [ 0.05659738,  0.10748,    -0.99259496],
-                       [-0.11056121, -0.07688656, -0.99089086],
-                       [-0.04565653,  0.14132655, -0.9889096 ]])
-    assert np.allclose(normals[0,:5,:], target)
-    assert np.allclose(normals[1, :5, :], target)
-
-    normals = compute_dipole_orientations(
-        'orig_surf_norm',
-        ['pial', 'white'],
-        './output',
-        fixed=True
-    )
-
-    target = np.array([[ 0.4929678,  -0.1130688, -0.8626692 ],
-                       [-0.4485411,  -0.16056265, -0.87922156],
-                       [-0.16060773, -0.21938397 ,-0.9623283 ],
-                       [ 0.16595066,  0.21885467, -0.961542  ],
-                       [ 0.08390685,  0.22491537, -0.97075886]])
-    assert np.allclose(normals[0,:5,:], target)
-    assert np.allclose(normals[1, :5, :], target)
-
-    normals = compute_dipole_orientations(
-        'cps',
-        ['pial', 'white'],
-        './output',
-        fixed=True
-    )
-
-    target = np.array([[ 1.8139431e-01, -2.7962229e-01 ,-9.4281888e-01],
-                       [-1.0353364e-02, -7.2763674e-02, -9.9729550e-01],
-                       [ 3.1780198e-04, -1.1128817e-01 ,-9.9378812e-01],
-                       [-1.8438324e-02, -1.2312002e-02, -9.9975419e-01],
-                       [ 7.1880430e-02,  1.5277593e-01, -9.8564333e-01]])
-    assert np.allclose(normals[0,:5,:], target)
-    assert np.allclose(normals[1,:5,:], target)
+    n_verts = target.shape[0]
+    np.testing.assert_allclose(normals[0, :n_verts, :], target, rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(normals[1, :n_verts, :], target, rtol=1e-5, atol=1e-8)
 
 
 def test_create_layer_mesh():
@@ -803,6 +835,7 @@ def test_postprocess_freesurfer_surfaces():
     """
     subj_id = 'sub-104'
     out_dir = './output'
+    _ = make_directory('./', ['output'])
     shutil.copy('./test_data/sub-104/surf/lh.pial.gii', './output/lh.pial.gii')
     shutil.copy('./test_data/sub-104/surf/lh.white.gii', './output/lh.white.gii')
     shutil.copy('./test_data/sub-104/surf/lh.white.gii', './output/lh.inflated.gii')
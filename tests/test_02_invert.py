@@ -12,41 +12,62 @@ from lameg.invert import (coregister, invert_ebb, invert_msp, load_source_time_s
                           invert_sliding_window)
 from lameg.util import get_fiducial_coords, make_directory
 
-
-@pytest.mark.dependency()
-def test_coregister(spm):
+# Expected first values of the inversion outputs
+MSP_MU_MATRIX = np.array([1.01755888e-04, -1.31537562e-05, -1.46884080e-04, -4.21048807e-04,
+                          -7.16753356e-04, -1.23996197e-03, -1.64400621e-03, -2.66500725e-04,
+                          -4.32804336e-04, -6.46597353e-04])
+SOURCE_TIME_SERIES = np.array([-2.43517717, -2.17243199, 7.50516469, -4.26512417, -0.01384067,
+                               -1.77825104, -3.05322203, 0.16328624, -2.27361571, -2.79355311])
+SOURCE_TIME = np.array([-0.5, -0.49833333, -0.49666667, -0.495, -0.49333333, -0.49166667, -0.49,
+                        -0.48833333, -0.48666667, -0.485])
+SLIDING_FREE_ENERGY = np.array([-113846.23389608, -115796.21846236, -115796.21846236,
+                                -116513.33866804, -117680.12092327, -117680.12092327,
+                                -117987.10301609, -117790.06978323, -117067.60766185,
+                                -117518.04531009])
+SLIDING_WOIS = np.array([-100., -100., -100., -100., -100., -100., -98.33333333, -96.66666667,
+                         -95., -93.33333333])
+NO_OVERLAP_FREE_ENERGY = np.array([-117680.12092327, -117877.03529818, -117761.38616428,
+                                   -117456.72473673, -119142.55620933, -118125.46196952,
+                                   -118169.27464856, -119110.227163, -119041.55656787,
+                                   -117937.72566738])
+NO_OVERLAP_WOIS = np.array([-1.00000000e+02, -8.33333333e+01, -6.66666667e+01, -5.00000000e+01,
+                            -3.33333333e+01, -1.66666667e+01, 2.84217094e-14, 1.66666667e+01,
+                            3.33333333e+01, 5.00000000e+01])
+EBB_MU_MATRIX = np.array([5.56419981e-08, -7.92645103e-07, -9.95737798e-07, -2.87239768e-07,
+                          4.75528010e-07, 8.49869087e-07, -1.22866823e-06, -1.49523945e-06,
+                          2.08794368e-07, 1.48255156e-06])
+
+
+def _link_or_copy(src, dst):
     """
-    Tests the coregistration process for neuroimaging data, ensuring that the output is properly
-    formatted and correctly written to the simulation output files.
+    Hard link a test data file into the output directory, copying it if linking is not possible.
 
-    This test is dependent on the successful execution of `test_smoothmesh_multilayer_mm`, as it
-    uses data files prepared and potentially modified by that prior test.
+    Only used for files that are read but not written by the tests, as writes to a hard link would
+    modify the original test data.
 
-    This test performs several key operations:
-    1. Retrieves fiducial coordinates necessary for coregistration from a participant's metadata.
-    2. Prepares a specific MEG data file for simulation based on test data paths and session
-       identifiers.
-    3. Copies necessary data files to a designated output directory for processing.
-    4. Executes the coregistration function using specified MRI files and mesh data for the forward
-       model.
-    5. Validates the presence of specific data structures in the output files to verify successful
-       coregistration.
+    Parameters:
+    src (str): Path to the file to link.
+    dst (str or Path): Destination path.
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
 
-    Specific checks include:
-    - Verifying that the 'inv' (inverse solution) field does not exist in the original data file's
-      structure to ensure it's unprocessed.
-    - Confirming that the 'inv' field is present in the new file after coregistration, indicating
-      successful processing and data integrity.
 
-    Methods used:
-    - get_fiducial_coords to fetch fiducial points.
-    - make_directory to create a directory for output data.
-    - shutil.copy to duplicate necessary files to the working directory.
-    - coregister function to align MEG data with an anatomical MRI using the fiducial points and
-      the specified mesh.
-    - h5py.File to interact with HDF5 file format for assertions on data structure.
+@pytest.fixture(scope="module")
+def coregistered(spm):
     """
+    Copies the test MEG data file to the output directory and coregisters it to the pial mesh.
+
+    The coregistration is run once for the module and the resulting data file is shared by the
+    tests that invert it, and by the tests that later load the inversion results.
 
+    Returns:
+    str: Path to the coregistered data file.
+    """
     test_data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../test_data')
     subj_id = 'sub-104'
     ses_id = 'ses-01'
@@ -69,12 +90,12 @@ def test_coregister(spm):
     # Where to put simulated data
     out_dir = make_directory('./', ['output'])
 
-    # Copy data files to tmp directory
+    # Copy data files to tmp directory (the .dat file is only read, so it is hard linked)
     shutil.copy(
         os.path.join(data_path, f'{data_base}.mat'),
         out_dir.joinpath(f'{data_base}.mat')
     )
-    shutil.copy(
+    _link_or_copy(
         os.path.join(data_path, f'{data_base}.dat'),
         out_dir.joinpath(f'{data_base}.dat')
     )
@@ -112,15 +133,61 @@ def test_coregister(spm):
         spm_instance=spm
     )
 
+    return base_fname
+
+
+@pytest.mark.dependency()
+# pylint: disable=W0621
+def test_coregister(coregistered):
+    """
+    Tests the coregistration process for neuroimaging data, ensuring that the output is properly
+    formatted and correctly written to the simulation output files.
+
+    This test is dependent on the successful execution of `test_smoothmesh_multilayer_mm`, as it
+    uses data files prepared and potentially modified by that prior test.
+
+    The coregistration itself is performed by the `coregistered` fixture, which:
+    1. Retrieves fiducial coordinates necessary for coregistration from a participant's metadata.
+    2. Prepares a specific MEG data file for simulation based on test data paths and session
+       identifiers.
+    3. Copies necessary data files to a designated output directory for processing.
+    4. Executes the coregistration function using specified MRI files and mesh data for the forward
+       model.
+
+    This test then validates the presence of specific data structures in the output files to verify
+    successful coregistration.
+
+    Specific checks include:
+    - Verifying that the 'inv' (inverse solution) field does not exist in the original data file's
+      structure to ensure it's unprocessed.
+    - Confirming that the 'inv' field is present in the new file after coregistration, indicating
+      successful processing and data integrity.
+
+    Methods used:
+    - h5py.File to interact with HDF5 file format for assertions on data structure.
+    """
+
+    test_data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../test_data')
+
+    # Original data file the simulations are based on
+    data_file = os.path.join(
+        test_data_path,
+        'sub-104',
+        'meg',
+        'ses-01',
+        'spm/spm-converted_autoreject-sub-104-ses-01-001-btn_trial-epo.mat'
+    )
+
     with h5py.File(data_file, 'r') as old_file:
         assert 'inv' not in old_file['D']['other']
 
-    with h5py.File(base_fname, 'r') as new_file:
+    with h5py.File(coregistered, 'r') as new_file:
         assert 'inv' in new_file['D']['other']
 
 
 @pytest.mark.dependency(depends=["test_coregister"])
-def test_invert_msp(spm):
+# pylint: disable=W0621
+def test_invert_msp(spm, coregistered):
     """
     Test the `invert_msp` function to ensure it accurately performs the inversion using specified
     parameters and a predefined mesh, verifying output against expected values.
@@ -150,12 +217,6 @@ def test_invert_msp(spm):
     test_data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../test_data')
     subj_id = 'sub-104'
 
-    # Data file to base simulations on
-    base_fname = os.path.join(
-        './output',
-        'spm-converted_autoreject-sub-104-ses-01-001-btn_trial-epo.mat'
-    )
-
     # Mesh to use for forward model in the simulations
     mesh_fname = os.path.join(
         test_data_path,
@@ -169,7 +230,7 @@ def test_invert_msp(spm):
     n_layers = 2
     [free_energy, cv_err] = invert_msp(
         mesh_fname,
-        base_fname,
+        coregistered,
         n_layers,
         patch_size=patch_size,
         n_temp_modes=n_temp_modes,
@@ -184,7 +245,7 @@ def test_invert_msp(spm):
     # pylint: disable=unbalanced-tuple-unpacking
     [free_energy, cv_err, mu_matrix] = invert_msp(
         mesh_fname,
-        base_fname,
+        coregistered,
         n_layers,
         priors=[47507],
         patch_size=patch_size,
@@ -194,17 +255,15 @@ def test_invert_msp(spm):
         spm_instance=spm
     )
 
-    target = np.array([ 1.01755888e-04, -1.31537562e-05, -1.46884080e-04, -4.21048807e-04,
-                        -7.16753356e-04, -1.23996197e-03, -1.64400621e-03, -2.66500725e-04,
-                        -4.32804336e-04, -6.46597353e-04])
-    assert np.allclose(mu_matrix[47507,:10], target)
+    np.testing.assert_allclose(mu_matrix[47507, :10], MSP_MU_MATRIX, rtol=1e-5, atol=1e-8)
     target = -530908.9460491342
     assert np.isclose(free_energy[()], target)
     assert np.allclose(cv_err, [1, 0])
 
 
 @pytest.mark.dependency(depends=["test_invert_msp"])
-def test_load_source_time_series():
+# pylint: disable=W0621
+def test_load_source_time_series(coregistered):
     """
     Tests the `load_source_time_series` function to ensure it correctly loads and processes
     source-level time series data from simulation output files.
@@ -231,26 +290,11 @@ def test_load_source_time_series():
     data accuracy and correct functionality.
     """
 
-    # Data file to base simulations on
-    base_fname = os.path.join(
-        './output',
-        'spm-converted_autoreject-sub-104-ses-01-001-btn_trial-epo.mat'
-    )
-
-    time_series, time, mu_matrix = load_source_time_series(base_fname, vertices=[47507])
+    time_series, time, mu_matrix = load_source_time_series(coregistered, vertices=[47507])
 
-    target = np.array([-2.43517717, -2.17243199, 7.50516469, -4.26512417, -0.01384067, -1.77825104,
-                       -3.05322203, 0.16328624, -2.27361571, -2.79355311])
-    assert np.allclose(time_series[0,:10,0], target)
-
-    target = np.array([[-0.5,        -0.49833333, -0.49666667, -0.495,      -0.49333333,
-                        -0.49166667, -0.49,       -0.48833333, -0.48666667, -0.485     ]])
-    assert np.allclose(time[:10], target)
-
-    target = np.array([ 1.01755888e-04, -1.31537562e-05, -1.46884080e-04, -4.21048807e-04,
-                        -7.16753356e-04, -1.23996197e-03, -1.64400621e-03, -2.66500725e-04,
-                        -4.32804336e-04, -6.46597353e-04])
-    assert np.allclose(mu_matrix[0,:10], target)
+    np.testing.assert_allclose(time_series[0, :10, 0], SOURCE_TIME_SERIES, rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(time[:10], SOURCE_TIME, rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(mu_matrix[0, :10], MSP_MU_MATRIX, rtol=1e-5, atol=1e-8)
 
 
 @pytest.mark.dependency(depends=["test_load_source_time_series"])
@@ -305,12 +349,12 @@ def test_invert_sliding_window(spm):
     # Where to put simulated data
     out_dir = make_directory('./', ['output'])
 
-    # Copy data files to tmp directory
+    # Copy data files to tmp directory (the .dat file is only read, so it is hard linked)
     shutil.copy(
         os.path.join(data_path, f'{data_base}.mat'),
         out_dir.joinpath(f'{data_base}.mat')
     )
-    shutil.copy(
+    _link_or_copy(
         os.path.join(data_path, f'{data_base}.dat'),
         out_dir.joinpath(f'{data_base}.dat')
     )
@@ -355,14 +399,8 @@ def test_invert_sliding_window(spm):
         spm_instance=spm
     )
 
-    target = np.array([-113846.23389608, -115796.21846236, -115796.21846236, -116513.33866804,
-                       -117680.12092327, -117680.12092327, -117987.10301609, -117790.06978323,
-                       -117067.60766185, -117518.04531009])
-    assert np.allclose(free_energy[:10], target)
-
-    target=np.array([-100., -100., -100., -100., -100.,
-                     -100., -98.33333333, -96.66666667, -95., -93.33333333])
-    assert np.allclose(wois[:10,0], target)
+    np.testing.assert_allclose(free_energy[:10], SLIDING_FREE_ENERGY, rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(wois[:10, 0], SLIDING_WOIS, rtol=1e-5, atol=1e-8)
 
     [free_energy, wois] = invert_sliding_window(
         47507,
@@ -373,19 +411,13 @@ def test_invert_sliding_window(spm):
         spm_instance=spm
     )
 
-    target = np.array([-117680.12092327, -117877.03529818, -117761.38616428, -117456.72473673,
-                       -119142.55620933, -118125.46196952, -118169.27464856, -119110.227163,
-                       -119041.55656787, -117937.72566738])
-    assert np.allclose(free_energy[:10], target)
-
-    target = np.array([-1.00000000e+02, -8.33333333e+01, -6.66666667e+01, -5.00000000e+01,
-                       -3.33333333e+01, -1.66666667e+01,  2.84217094e-14,  1.66666667e+01,
-                       3.33333333e+01,  5.00000000e+01])
-    assert np.allclose(wois[:10, 0], target)
+    np.testing.assert_allclose(free_energy[:10], NO_OVERLAP_FREE_ENERGY, rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(wois[:10, 0], NO_OVERLAP_WOIS, rtol=1e-5, atol=1e-8)
 
 
 @pytest.mark.dependency(depends=["test_invert_sliding_window"])
-def test_invert_ebb(spm):
+# pylint: disable=W0621
+def test_invert_ebb(spm, coregistered):
     """
     Test the `invert_ebb` function to ensure it performs correctly with specified parameters and
     conditions.
@@ -412,12 +444,6 @@ def test_invert_ebb(spm):
     test_data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../test_data')
     subj_id = 'sub-104'
 
-    # Data file to base simulations on
-    base_fname = os.path.join(
-        './output',
-        'spm-converted_autoreject-sub-104-ses-01-001-btn_trial-epo.mat'
-    )
-
     # Mesh to use for forward model in the simulations
     mesh_fname = os.path.join(
         test_data_path,
@@ -432,7 +458,7 @@ def test_invert_ebb(spm):
     # pylint: disable=unbalanced-tuple-unpacking
     [free_energy, cv_err, mu_matrix] = invert_ebb(
         mesh_fname,
-        base_fname,
+        coregistered,
         n_layers,
         patch_size=patch_size,
         n_temp_modes=n_temp_modes,
@@ -441,10 +467,7 @@ def test_invert_ebb(spm):
         spm_instance=spm
     )
 
-    target = np.array([5.56419981e-08, -7.92645103e-07, -9.95737798e-07, -2.87239768e-07,
-                       4.75528010e-07,  8.49869087e-07, -1.22866823e-06, -1.49523945e-06,
-                       2.08794368e-07,  1.48255156e-06])
-    assert np.allclose(mu_matrix[0,:10], target)
+    np.testing.assert_allclose(mu_matrix[0, :10], EBB_MU_MATRIX, rtol=1e-5, atol=1e-8)
     target = -413893.00662024197
     assert np.isclose(free_energy[()], target)
     assert np.allclose(cv_err, [1, 0])